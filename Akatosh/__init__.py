@@ -19,4 +19,18 @@ colors = {
 stream_formatter = colorlog.ColoredFormatter(cformat, log_colors=colors)
 stream_handler.setFormatter(stream_formatter)
 logger.addHandler(stream_handler)
-logger.setLevel(logging.DEBUG)
\ No newline at end of file
+logger.setLevel(logging.DEBUG)
+
+# numpy is optional, it is only needed by streams, populations, monitors and stopping conditions
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover
+    _np = None
+
+
+def _require_numpy(feature: str) -> None:
+    """Raise an ImportError naming the feature if numpy is not installed."""
+    if _np is None:
+        raise ImportError(
+            f"numpy is required for {feature}, install it with 'pip install Akatosh[numpy]'."
+        )
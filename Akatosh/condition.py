@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional
+
+from . import logger
+from .event import Event
+from .universe import Mundus
+
+
+class Condition:
+
+    def __init__(
+        self,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> None:
+        """Create a condition which is triggered once by the state change it subscribes to, it is never polled.
+
+        A condition has an ended state like an event, so it can be used as the at or till of an event or an entity, or combined with other conditions and events.
+
+        Args:
+            action (Optional[Callable], optional): what happens when the condition is triggered, scheduled as an instant event at the trigger time. Defaults to None.
+            label (Optional[str], optional): short description for the condition. Defaults to None.
+            priority (int, optional): the priority of the action event. Defaults to 0.
+        """
+        self._action = action
+        self._label = label
+        self._priority = priority
+        self._ended = False
+        self._triggered_at: Optional[float] = None
+        self._listeners: List[Callable[[], Any]] = list()
+
+    def __str__(self) -> str:
+        """Return the label of the condition if it has one, otherwise return the id of the condition."""
+        if self.label is None:
+            return f"Condition {id(self)}"
+        return self.label
+
+    def __and__(self, other: Condition | Event) -> AllOf:
+        """Return a condition triggered when both this and the other are ended."""
+        return AllOf(self, other)
+
+    def __or__(self, other: Condition | Event) -> AnyOf:
+        """Return a condition triggered when either this or the other is ended."""
+        return AnyOf(self, other)
+
+    def _subscribe(self, listener: Callable[[], Any]) -> None:
+        """Call the listener once the condition is triggered, immediately if it already is."""
+        if self.ended:
+            listener()
+        else:
+            self._listeners.append(listener)
+
+    def _unsubscribe(self, listener: Callable[[], Any]) -> None:
+        """Stop calling the listener once the condition is triggered."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _trigger(self) -> None:
+        """Mark the condition as ended, notify the listeners and schedule the action."""
+        if self.ended:
+            return
+        self._ended = True
+        self._triggered_at = Mundus.time
+        logger.debug(f"{self} triggered at {Mundus.time}.")
+        listeners, self._listeners = self._listeners, list()
+        for listener in listeners:
+            listener()
+        if self._action is not None:
+            Event(
+                at=Mundus.time,
+                till=Mundus.time,
+                action=self._action,
+                label=f"{self} Action",
+                once=True,
+                priority=self.priority,
+            )
+
+    @property
+    def ended(self) -> bool:
+        """Return whether the condition has been triggered or not."""
+        return self._ended
+
+    @property
+    def triggered_at(self) -> Optional[float]:
+        """Return the time when the condition was triggered."""
+        return self._triggered_at
+
+    @property
+    def label(self) -> Optional[str]:
+        """Return the label of the condition."""
+        return self._label
+
+    @property
+    def priority(self) -> int:
+        """Return the priority of the action event."""
+        return self._priority
+
+
+class AllOf(Condition):
+
+    def __init__(
+        self,
+        *dependencies: Condition | Event,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> None:
+        """Create a condition triggered when all the given conditions and events are ended.
+
+        Args:
+            dependencies (Condition | Event): the conditions and events to wait for.
+            action (Optional[Callable], optional): what happens when the condition is triggered. Defaults to None.
+            label (Optional[str], optional): short description for the condition. Defaults to None.
+            priority (int, optional): the priority of the action event. Defaults to 0.
+        """
+        super().__init__(action, label, priority)
+        self._remaining = len(dependencies)
+        if self._remaining == 0:
+            self._trigger()
+        for dependency in dependencies:
+            dependency._subscribe(self._count)
+
+    def _count(self) -> None:
+        """Count down one ended dependency."""
+        self._remaining -= 1
+        if self._remaining == 0:
+            self._trigger()
+
+
+class AnyOf(Condition):
+
+    def __init__(
+        self,
+        *dependencies: Condition | Event,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> None:
+        """Create a condition triggered when any of the given conditions and events is ended.
+
+        Args:
+            dependencies (Condition | Event): the conditions and events to wait for.
+            action (Optional[Callable], optional): what happens when the condition is triggered. Defaults to None.
+            label (Optional[str], optional): short description for the condition. Defaults to None.
+            priority (int, optional): the priority of the action event. Defaults to 0.
+        """
+        super().__init__(action, label, priority)
+        self._dependencies = dependencies
+        for dependency in dependencies:
+            if self.ended:
+                break
+            dependency._subscribe(self._trigger)
+
+    def _trigger(self) -> None:
+        """Stop listening to the other dependencies, then trigger the condition."""
+        if self.ended:
+            return
+        dependencies, self._dependencies = self._dependencies, tuple()
+        for dependency in dependencies:
+            dependency._unsubscribe(self._trigger)
+        super()._trigger()
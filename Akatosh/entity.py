@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import asyncio
 from math import inf
-from typing import TYPE_CHECKING, Callable, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
 from . import logger
-from .event import Event
+from .condition import Condition
+from .event import Event, cancel_events
 from .universe import Mundus
 
 if TYPE_CHECKING:
+    from .population import Population
     from .resource import Resource
+    from .store import Store
 
 
 class Entity:
@@ -35,6 +38,7 @@ class Entity:
         self._created = False
         self._terminated = False
         self._priority = priority
+        Mundus._live_entities += 1
 
         # create an instant creation event
         self._creation = Event(
@@ -54,12 +58,22 @@ class Entity:
             priority=self.priority,
         )
 
-        # create a queue for engaged events
-        self._events: List[Event] = list()
+        # create a queue for engaged events, ended events remove themselves
+        self._events: Dict[Event, None] = dict()
 
         # create a queue for acquired resources
         self._occupied_resources: List[Resource] = list()
 
+        # create a queue for stores the entity is waiting on
+        self._stores: List[Store] = list()
+
+        # create a queue for populations the entity joined
+        self._populations: List[Population] = list()
+
+        # create queues for conditions waiting on the life cycle of the entity
+        self._on_created: List[Condition] = list()
+        self._on_terminated: List[Condition] = list()
+
     def __str__(self) -> str:
         """Return the label of the entity if it exists, otherwise return the id of the entity."""
         if self.label is None:
@@ -69,22 +83,36 @@ class Entity:
     def _create(self):
         """Called when the entity is created."""
         self._created = True
+        for population in self.populations:
+            population._activate(self)
+        for condition in self._on_created:
+            condition._trigger()
+        self._on_created.clear()
         logger.debug(f"Entity {self} created.")
 
     def _terminate(self):
         """Called when the entity is terminated."""
         self._terminated = True
-        for event in self.events:
-            event.cancel()
+        Mundus._live_entities -= 1
+        Mundus._retired_entities += 1
+        cancel_events(self.events)
         for resource in self.occupied_resources:
             resource.collect(self, inf)
+        for store in list(self.stores):
+            store.withdraw(self)
+        for population in self.populations:
+            population._leave(self)
+        self.populations.clear()
+        for condition in self._on_terminated:
+            condition._trigger()
+        self._on_terminated.clear()
         logger.debug(f"Entity {self} terminated.")
 
     def event(
         self,
         at: float | Event,
         till: float | Event,
-        step: float = Mundus.time_step,
+        step: float | Callable[[], float] = Mundus.time_step,
         label: Optional[str] = None,
         once: bool = False,
         priority: int = 0,
@@ -115,7 +143,8 @@ class Entity:
                     once=once,
                     priority=priority,
                 )
-                self.events.append(event)
+                event._entity = self
+                self._events[event] = None
                 logger.debug(f"Event {event} added to entity {self}.")
 
             Event(
@@ -138,6 +167,34 @@ class Entity:
         else:
             return False
 
+    def when_created(
+        self,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> Condition:
+        """Return a condition triggered once the entity is created."""
+        condition = Condition(action, label or f"{self} Created", priority)
+        if self.created:
+            condition._trigger()
+        else:
+            self._on_created.append(condition)
+        return condition
+
+    def when_terminated(
+        self,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> Condition:
+        """Return a condition triggered once the entity is terminated."""
+        condition = Condition(action, label or f"{self} Terminated", priority)
+        if self.terminated:
+            condition._trigger()
+        else:
+            self._on_terminated.append(condition)
+        return condition
+
     @property
     def label(self):
         """Short description of the entity."""
@@ -155,14 +212,24 @@ class Entity:
 
     @property
     def events(self):
-        """The events that the entity is engaged with."""
-        return self._events
+        """The events that the entity is engaged with and have not ended yet."""
+        return list(self._events)
 
     @property
     def occupied_resources(self):
         """The resources that the entity is using."""
         return self._occupied_resources
 
+    @property
+    def stores(self):
+        """The stores that the entity is waiting to put into or get from."""
+        return self._stores
+
+    @property
+    def populations(self):
+        """The populations that the entity joined."""
+        return self._populations
+
     @property
     def priority(self):
         """The priority of the entity."""
@@ -1,10 +1,19 @@
 from __future__ import annotations
 import asyncio
 import time
-from typing import Any, Callable, Optional
+import weakref
+from itertools import count
+from math import inf
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional
 from . import logger
 from .universe import Mundus
 
+if TYPE_CHECKING:
+    from .condition import AllOf, AnyOf, Condition
+
+
+_creation_order = count()
+
 
 class Event:
 
@@ -13,7 +22,7 @@ class Event:
         at: float | Event,
         till: float | Event,
         action: Callable,
-        step: float = Mundus.time_step,
+        step: float | Callable[[], float] = Mundus.time_step,
         label: Optional[str] = None,
         once: bool = False,
         priority: int = 0,
@@ -25,6 +34,7 @@ class Event:
             at (float | Event): when the event should start.
             till (float | Event): when the event should end.
             action (Callable): what happens during the event.
+            step (float | Callable[[], float], optional): the interval between two acts, a callable is drawn again after every act, for example from a random stream. Defaults to the simulation time step.
             label (Optional[str], optional): Short description for the event. Defaults to None.
             once (bool, optional): whether this event should only happen once, regardless of at or till. Defaults to False.
             priority (int, optional): the priority of the event, event with lower value will happen before the events with a higher priority value. Defaults to 0.
@@ -32,8 +42,15 @@ class Event:
         Raises:
             ValueError: _description_
         """
+        # dependencies on other events or conditions are held until they end, then only weakly so they can be collected
         self._at = at
         self._till = till
+        self._at_dependency = hasattr(at, "ended")
+        self._till_dependency = hasattr(till, "ended")
+        self._at_ended = False
+        self._till_ended = False
+        self._entity = None
+        self._listeners: Optional[List[Callable[[], Any]]] = None
         self._action = action
         self._started = False
         self._acted = False
@@ -43,19 +60,53 @@ class Event:
         self._once = once
         self._priority = priority
         self._step = step
+        self._interval = step() if callable(step) else step
         self._watchdog = watchdog
         self._next = 0
+        self._at_tick = 0
+        self._till_tick = 0
+        self._step_tick = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._wheeled = False
+        self._wheel_entry: Optional[list] = None
+        self._order = next(_creation_order)
         Mundus.pending_events.append(self)
+        Mundus._live_events += 1
         if self.priority > Mundus.max_event_priority:
             Mundus._max_event_priority = self.priority
+        if self._at_dependency:
+            at._subscribe(self._at_reached)
+        if self._till_dependency:
+            till._subscribe(self._till_reached)
 
     async def __call__(self) -> Any:
         """Make the event callable, so it can be awaited like a coroutine."""
+        self._prepare()
         while True:
 
             if self.ended == True:
                 return
 
+            # a paused event sleeps until it is resumed or its end time passes instead of waking every time step
+            if self.paused == True:
+                if self._till_passed():
+                    self._end()
+                    logger.debug(f"Event {self} ended at {Mundus.time}.")
+                    return
+                await self._sleep()
+                continue
+
+            # an event waiting for another event or condition sleeps until it ends instead of checking every time step
+            if (
+                self.started == False
+                and self._at_dependency
+                and not self._at_ended
+                and not self._till_passed()
+            ):
+                await self._sleep()
+                continue
+
             while True:
                 if self.priority == Mundus.current_event_priority:
                     break
@@ -63,98 +114,61 @@ class Event:
                     await asyncio.sleep(0)
 
             if self.started == False:
-                if isinstance(self.at, Event):
-                    if self.at.ended == True:
+                if self._at_dependency:
+                    if self._at_ended:
                         self._started = True
-                        self._next = Mundus.time
+                        self._next = Mundus.ticks
                         logger.debug(f"Event {self} started at {Mundus.time}.")
                 else:
-                    if self.at <= Mundus.time:
+                    if self._at_tick <= Mundus.ticks:
                         self._started = True
-                        self._next = Mundus.time
+                        self._next = Mundus.ticks
                         logger.debug(f"Event {self} started at {Mundus.time}.")
 
             if (
                 self.started == True
                 and self.ended == False
                 and self.paused == False
-                and self.next <= Mundus.time
+                and self._next <= Mundus.ticks
             ):
                 # Following IEC 61131 -3, if a event exceeded its deadline, it should be logged and not executed further. Real-time mode only.
-                _waiting_duration = Mundus.time - self.next
-                if (
-                    Mundus.realtime
-                    and Mundus.time_scale == 1
-                    and self.step != Mundus.time_step
-                    and _waiting_duration > self.step
-                ):
-                    logger.error(
-                        f"Event {self} waiting time exceeded deadline by {_waiting_duration-self.step} seconds."
-                    )
-                    if self.watchdog is not None:
-                        self.watchdog()
+                _waiting_duration = Mundus.to_time(Mundus.ticks - self._next)
+                if self._deadline_exceeded(_waiting_duration, "waiting time exceeded"):
                     return
                 _execution_start_time = time.perf_counter()
-                if asyncio.iscoroutinefunction(self._action):
-                    await self._action()
-                else:
-                    self._action()
-                _execution_end_time = time.perf_counter()
-                _execution_duration = _execution_end_time - _execution_start_time
-                if (
-                    Mundus.realtime
-                    and Mundus.time_scale == 1
-                    and self.step != Mundus.time_step
-                    and _execution_duration > self.step
-                ):
-                    logger.error(
-                        f"Event {self} execution exceeded deadline by {_execution_duration-self.step} seconds."
-                    )
-                    if self.watchdog is not None:
-                        self.watchdog()
+                try:
+                    if asyncio.iscoroutinefunction(self._action):
+                        await self._action()
+                    else:
+                        self._action()
+                except asyncio.CancelledError:
+                    # the action was cancelled, for example while waiting on a store, so the event cannot continue
+                    self._end()
+                    logger.debug(f"Event {self} cancelled.")
+                    raise
+                except Exception:
+                    # the event cannot continue after its action failed
+                    self._end()
+                    raise
+                _execution_duration = time.perf_counter() - _execution_start_time
+                if self._deadline_exceeded(_execution_duration, "execution exceeded"):
                     return
-                _event_duration = _waiting_duration + _execution_duration
-                if (
-                    Mundus.realtime
-                    and Mundus.time_scale == 1
-                    and self.step != Mundus.time_step
-                    and _event_duration > self.step
+                if self._deadline_exceeded(
+                    _waiting_duration + _execution_duration, "exceeded"
                 ):
-                    logger.error(
-                        f"Event {self} exceeded deadline by {_event_duration-self.step} seconds."
-                    )
-                    if self.watchdog is not None:
-                        self.watchdog()
                     return
-                self._acted = True
-                if Mundus.realtime:
-                    if self.step != Mundus.time_step:
-                        self._next = round(
-                            Mundus.time + self.step,
-                            Mundus.time_resolution,
-                        )
-                    else:
-                        self._next = Mundus.time
-                else:
-                    self._next += max(Mundus.time_step, self.step)
-                    self._next = round(self._next, Mundus.time_resolution)
+                self._advance()
                 logger.debug(f"Event {self} acted at {Mundus.time}.")
                 if self._once == True:
-                    self._ended = True
+                    self._end()
                     logger.debug(f"Event {self} ended at {Mundus.time}.")
                     return
 
             if self.ended == False:
-                if isinstance(self.till, Event):
-                    if self.till.ended == True:
-                        self._ended = True
-                        logger.debug(f"Event {self} ended at {Mundus.time}.")
-                        return
-                else:
-                    if self.till <= Mundus.time:
-                        self._ended = True
-                        logger.debug(f"Event {self} ended at {Mundus.time}.")
-                        return
+                if self._till_passed():
+                    self._end()
+                    logger.debug(f"Event {self} ended at {Mundus.time}.")
+                    return
             await asyncio.sleep(0)
 
     def __str__(self) -> str:
@@ -163,30 +177,240 @@ class Event:
             return f"Event {id(self)}"
         return self.label
 
-    def cancel(self):
-        """Cancel the event."""
+    def __and__(self, other: Condition | Event) -> AllOf:
+        """Return a condition triggered when both this and the other are ended."""
+        from .condition import AllOf
+
+        return AllOf(self, other)
+
+    def __or__(self, other: Condition | Event) -> AnyOf:
+        """Return a condition triggered when either this or the other is ended."""
+        from .condition import AnyOf
+
+        return AnyOf(self, other)
+
+    def _prepare(self):
+        """Convert the timing to integer ticks once, so activations only compare integers."""
+        if not self._at_dependency:
+            self._at_tick = Mundus.to_ticks(self._at)
+        if not self._till_dependency:
+            self._till_tick = Mundus.to_ticks(self._till)
+        self._step_tick = Mundus.to_ticks(self.step)
+
+    def _till_passed(self) -> bool:
+        """Return whether the end time of the event has passed."""
+        if self._till_dependency:
+            return self._till_ended
+        return self._till_tick <= Mundus.ticks
+
+    async def _sleep(self):
+        """Sleep until the event is woken up, at the latest when its end time passes."""
+        self._wakeup = asyncio.Event()
+        Mundus._sleep(self, inf if self._till_dependency else self._till_tick)
+        try:
+            await self._wakeup.wait()
+        finally:
+            self._wakeup = None
+            Mundus._woken.discard(self)
+
+    def _at_reached(self):
+        """Called once the start dependency has ended, it is then only held weakly."""
+        self._at_ended = True
+        self._at = weakref.ref(self._at)
+        self._wake()
+
+    def _till_reached(self):
+        """Called once the end dependency has ended, it is then only held weakly."""
+        self._till_ended = True
+        self._till = weakref.ref(self._till)
+        self._wake()
+
+    def _wake(self):
+        """Wake up the sleeping event so it checks its state again, a paused event driven by the timing wheel ends here once its end time has passed."""
+        Mundus._awake(self)
+        if self._wheeled:
+            if self.paused and not self.ended and self._till_passed():
+                self._unschedule()
+                self._end()
+                logger.debug(f"Event {self} ended at {Mundus.time}.")
+            return
+        if self._wakeup is not None:
+            Mundus._woken.add(self)
+            self._wakeup.set()
+
+    def _deadline_exceeded(self, duration: float, description: str) -> bool:
+        """Log and call the watchdog if the duration exceeded the step of the event. Real-time mode only."""
+        if (
+            Mundus.realtime
+            and Mundus.time_scale == 1
+            and self.step != Mundus.time_step
+            and duration > self.step
+        ):
+            logger.error(
+                f"Event {self} {description} deadline by {duration-self.step} seconds."
+            )
+            if self.watchdog is not None:
+                self.watchdog()
+            return True
+        return False
+
+    def _advance(self):
+        """Record an act and move next to the following activation."""
+        self._acted = True
+        if Mundus.realtime:
+            if self.step != Mundus.time_step:
+                self._next = Mundus.ticks + self._step_tick
+            else:
+                self._next = Mundus.ticks
+        else:
+            self._next += max(1, self._step_tick)
+        if callable(self._step):
+            self._interval = self._step()
+            self._step_tick = Mundus.to_ticks(self._interval)
+
+    def _fire(self):
+        """Activate the event on behalf of the timing wheel and schedule its next activation."""
+        if self.ended:
+            return
+        if self.paused:
+            if self._till_passed():
+                self._end()
+                logger.debug(f"Event {self} ended at {Mundus.time}.")
+            else:
+                Mundus._sleep(self, self._till_tick)
+            return
+        if not self.started and self._at_tick <= Mundus.ticks:
+            self._started = True
+            self._next = Mundus.ticks
+            logger.debug(f"Event {self} started at {Mundus.time}.")
+        if self.started and self._next <= Mundus.ticks:
+            # Following IEC 61131 -3, if a event exceeded its deadline, it should be logged and not executed further. Real-time mode only.
+            _waiting_duration = Mundus.to_time(Mundus.ticks - self._next)
+            if self._deadline_exceeded(_waiting_duration, "waiting time exceeded"):
+                return
+            _execution_start_time = time.perf_counter()
+            try:
+                self._action()
+            except Exception:
+                # only this event ends, like a task whose action raised
+                logger.exception(f"Event {self} failed at {Mundus.time}.")
+                self._end()
+                return
+            _execution_duration = time.perf_counter() - _execution_start_time
+            if self._deadline_exceeded(_execution_duration, "execution exceeded"):
+                return
+            if self._deadline_exceeded(
+                _waiting_duration + _execution_duration, "exceeded"
+            ):
+                return
+            self._advance()
+            logger.debug(f"Event {self} acted at {Mundus.time}.")
+            if self.ended == True:
+                return
+            if self._once == True:
+                self._end()
+                logger.debug(f"Event {self} ended at {Mundus.time}.")
+                return
+        if self._till_tick <= Mundus.ticks:
+            self._end()
+            logger.debug(f"Event {self} ended at {Mundus.time}.")
+            return
+        if not self.paused:
+            tick = self._next if self.started else self._at_tick
+            Mundus._wheel.schedule(
+                self, min(max(tick, Mundus.ticks + 1), self._till_tick)
+            )
+
+    def _unschedule(self):
+        """Remove the event from the timing wheel and cancel its task, unless the event is cancelling itself from its own action."""
+        if self._wheeled:
+            Mundus._wheel.cancel(self)
+        task, self._task = self._task, None
+        if task is None or task.done():
+            return
+        try:
+            current_task = asyncio.current_task()
+        except RuntimeError:
+            current_task = None
+        if task is not current_task:
+            task.cancel()
+
+    def _end(self):
+        """Mark the event as ended and drop it from the bookkeeping of the universe and its entity."""
+        if self._ended:
+            return
         self._ended = True
+        self._task = None
+        self._wakeup = None
+        # stop listening to the dependencies, so they do not keep the ended event alive
+        if self._at_dependency and not self._at_ended:
+            self._at._unsubscribe(self._at_reached)
+        if self._till_dependency and not self._till_ended:
+            self._till._unsubscribe(self._till_reached)
+        Mundus._awake(self)
+        Mundus._live_events -= 1
+        Mundus._retired_events += 1
+        if self._entity is not None:
+            self._entity._events.pop(self, None)
+            self._entity = None
+        if self._listeners is not None:
+            listeners, self._listeners = self._listeners, None
+            for listener in listeners:
+                listener()
+
+    def _subscribe(self, listener: Callable[[], Any]):
+        """Call the listener once the event has ended, immediately if it already has."""
+        if self.ended:
+            listener()
+            return
+        if self._listeners is None:
+            self._listeners = list()
+        self._listeners.append(listener)
+
+    def _unsubscribe(self, listener: Callable[[], Any]):
+        """Stop calling the listener once the event has ended."""
+        if self._listeners is not None and listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def cancel(self):
+        """Cancel the event, its task is released immediately."""
+        self._unschedule()
+        self._end()
         logger.debug(f"Event {self} cancelled.")
 
     def pause(self):
-        """Pause the event."""
+        """Pause the event. A paused event sleeps until it is resumed, or ends once its end time passes."""
         self._paused = True
         logger.debug(f"Event {self} paused.")
 
     def resume(self):
-        """Resume the event."""
+        """Resume the event, the next act is moved to the first time step of the event which is not in the past."""
         self._paused = False
+        if self.started and self._next < Mundus.ticks:
+            if Mundus.realtime:
+                self._next = Mundus.ticks
+            else:
+                step = max(1, self._step_tick)
+                steps = -((self._next - Mundus.ticks) // step)
+                self._next += steps * step
+        Mundus._awake(self)
+        if self._wakeup is not None:
+            Mundus._woken.add(self)
+            self._wakeup.set()
+        if self._wheeled and not self.ended:
+            tick = self._next if self.started else self._at_tick
+            Mundus._wheel.schedule(self, min(tick, self._till_tick))
         logger.debug(f"Event {self} resumed.")
 
     @property
     def at(self):
-        """Return the time when the event should start."""
-        return self._at
+        """Return the time or the event after which the event should start."""
+        return self._at() if isinstance(self._at, weakref.ref) else self._at
 
     @property
     def till(self):
-        """Return the time when the event should end."""
-        return self._till
+        """Return the time or the event after which the event should end."""
+        return self._till() if isinstance(self._till, weakref.ref) else self._till
 
     @property
     def started(self):
@@ -221,12 +445,20 @@ class Event:
     @property
     def next(self):
         """Return the next time the event acts."""
-        return self._next
+        return Mundus.to_time(self._next)
 
     @property
     def step(self):
-        """Return the time step of the event, which overwrites the simulation time step."""
-        return self._step
+        """Return the current time step of the event, which overwrites the simulation time step."""
+        return self._interval
+
+    def _wheelable(self) -> bool:
+        """Return whether the event can be driven by the timing wheel, which requires a fixed start and end time and a synchronous action."""
+        return (
+            not self._at_dependency
+            and not self._till_dependency
+            and not asyncio.iscoroutinefunction(self._action)
+        )
 
     @property
     def watchdog(self):
@@ -234,10 +466,22 @@ class Event:
         return self._watchdog
 
 
+def cancel_events(events: Iterable[Event]):
+    """Cancel all given events at once, for example when an entity is terminated."""
+    cancelled = 0
+    for event in list(events):
+        if event.ended:
+            continue
+        event._unschedule()
+        event._end()
+        cancelled += 1
+    logger.debug(f"{cancelled} events cancelled.")
+
+
 def event(
     at: float | Event,
     till: float | Event,
-    step: float = Mundus.time_step,
+    step: float | Callable[[], float] = Mundus.time_step,
     label: Optional[str] = None,
     once: bool = False,
     priority: int = 0,
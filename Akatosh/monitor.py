@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Callable
+
+from . import _np as np, _require_numpy
+
+
+class Monitor:
+
+    def __init__(
+        self, name: str, gauge: Callable[[], float], period: float, capacity: int = 1024
+    ) -> None:
+        """Create a monitor which records a gauge every period into preallocated arrays. Monitors are registered with Mundus.monitor and sampled by the universe, they do not run as events.
+
+        Args:
+            name (str): the unique name of the monitor.
+            gauge (Callable[[], float]): returns the value to record.
+            period (float): the time between two samples.
+            capacity (int, optional): the initial number of samples the arrays can hold, the universe reserves enough for the simulated horizon. Defaults to 1024.
+        """
+        _require_numpy("monitors")
+        if period <= 0:
+            raise ValueError("Period of the monitor must be greater than 0.")
+        self._name = name
+        self._gauge = gauge
+        self._period = period
+        self._times = np.empty(max(1, capacity), dtype=float)
+        self._values = np.empty(max(1, capacity), dtype=float)
+        self._samples = 0
+
+    def __str__(self) -> str:
+        """Return the name of the monitor."""
+        return f"Monitor {self.name}"
+
+    def reserve(self, samples: int) -> None:
+        """Make sure the arrays can hold the given number of samples in total."""
+        if samples <= len(self._times):
+            return
+        times = np.empty(samples, dtype=float)
+        values = np.empty(samples, dtype=float)
+        times[: self._samples] = self._times[: self._samples]
+        values[: self._samples] = self._values[: self._samples]
+        self._times = times
+        self._values = values
+
+    def _sample(self, time: float) -> None:
+        """Record the gauge at the given time."""
+        if self._samples == len(self._times):
+            self.reserve(2 * self._samples)
+        self._times[self._samples] = time
+        self._values[self._samples] = self._gauge()
+        self._samples += 1
+
+    @property
+    def name(self) -> str:
+        """The name of the monitor."""
+        return self._name
+
+    @property
+    def period(self) -> float:
+        """The time between two samples."""
+        return self._period
+
+    @property
+    def samples(self) -> int:
+        """The number of recorded samples."""
+        return self._samples
+
+    @property
+    def times(self):
+        """The times of the recorded samples."""
+        return self._times[: self._samples]
+
+    @property
+    def values(self):
+        """The recorded values."""
+        return self._values[: self._samples]
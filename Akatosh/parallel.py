@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import logger
+from .event import Event
+from .universe import Mundus
+
+
+class Partition:
+
+    def __init__(self, name: str, setup: Callable[[Partition], Any]) -> None:
+        """Create a logical process which simulates its own part of the model in a separate OS process.
+
+        Args:
+            name (str): the unique name of the partition, used as the target of messages.
+            setup (Callable[[Partition], Any]): builds the entities, resources and events of the partition, it is called inside the partition process before the simulation starts.
+        """
+        self._name = name
+        self._setup = setup
+        self._handler: Optional[Callable[[Any], Any]] = None
+        self._reporter: Optional[Callable[[], Any]] = None
+        self._peers: List[str] = list()
+        self._lookahead = 0
+        self._outbox: List[Tuple[str, int, Any]] = list()
+
+    def __str__(self) -> str:
+        """Return the name of the partition."""
+        return f"Partition {self.name}"
+
+    def receive(self, handler: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """Decorator to set the function which handles messages from other partitions, it is called at the timestamp of the message."""
+        self._handler = handler
+        return handler
+
+    def report(self, reporter: Callable[[], Any]) -> Callable[[], Any]:
+        """Decorator to set the function whose return value is sent back to the caller of simulate when the partition finishes."""
+        self._reporter = reporter
+        return reporter
+
+    def send(self, target: str, message: Any, delay: float) -> None:
+        """Send a message to another partition, it is delivered after the given delay which must not be less than the lookahead."""
+        if target not in self._peers:
+            raise ValueError(f"{self} cannot send to unknown partition {target}.")
+        if Mundus.to_ticks(delay) < self._lookahead:
+            raise ValueError(
+                f"{self} cannot send with delay {delay}, which is less than the lookahead {Mundus.to_time(self._lookahead)}."
+            )
+        self._outbox.append((target, Mundus.ticks + Mundus.to_ticks(delay), message))
+
+    def _deliver(self, tick: int, message: Any) -> None:
+        """Schedule the handling of a message received from another partition."""
+        if self._handler is None:
+            logger.warning(f"{self} has no handler, message {message} dropped.")
+            return
+        handler = self._handler
+        Event(
+            at=Mundus.to_time(tick),
+            till=Mundus.to_time(tick),
+            action=lambda: handler(message),
+            label=f"{self} Delivery",
+            once=True,
+        )
+
+    def _run(self, connection, till: float) -> None:
+        """Entry point of the partition process, simulates one time window at a time and exchanges messages in between."""
+        self._setup(self)
+        till_tick = Mundus.to_ticks(till)
+
+        async def windows():
+            while Mundus.ticks < till_tick:
+                window_end = min(till_tick, Mundus.ticks + self._lookahead)
+                await Mundus.simulate(Mundus.to_time(window_end))
+                connection.send(("window", self._outbox))
+                self._outbox = list()
+                for tick, message in connection.recv():
+                    self._deliver(tick, message)
+
+        asyncio.run(windows())
+        connection.send(
+            ("report", self._reporter() if self._reporter is not None else None)
+        )
+        connection.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the partition."""
+        return self._name
+
+    @property
+    def peers(self) -> List[str]:
+        """The names of the other partitions."""
+        return self._peers
+
+    @property
+    def lookahead(self) -> float:
+        """The minimum delay of messages between partitions."""
+        return Mundus.to_time(self._lookahead)
+
+
+def simulate(
+    partitions: Sequence[Partition], till: float, lookahead: float
+) -> Dict[str, Any]:
+    """Simulate the partitions in parallel, one OS process each, until the given time.
+
+    Partitions advance in lockstep time windows of the lookahead. Since every message is sent with a delay of at least the lookahead, a message never arrives inside the window it was sent in, so no partition has to roll back.
+
+    Args:
+        partitions (Sequence[Partition]): the partitions of the model, each with a unique name.
+        till (float): when the simulation ends.
+        lookahead (float): the minimum delay of messages between partitions, also the length of the time windows.
+
+    Raises:
+        ValueError: if the partition names are not unique or the lookahead is shorter than a time step.
+        RuntimeError: if a partition process fails.
+
+    Returns:
+        Dict[str, Any]: the reports of the partitions by name.
+    """
+    names = [partition.name for partition in partitions]
+    if len(set(names)) != len(names):
+        raise ValueError("Partition names must be unique.")
+    if Mundus.to_ticks(lookahead) < 1:
+        raise ValueError("Lookahead cannot be less than the time step.")
+
+    context = multiprocessing.get_context("fork")
+    connections = dict()
+    processes = list()
+    for partition in partitions:
+        partition._peers = [name for name in names if name != partition.name]
+        partition._lookahead = Mundus.to_ticks(lookahead)
+        parent_end, child_end = context.Pipe()
+        process = context.Process(
+            target=partition._run,
+            args=(child_end, till),
+            name=partition.name,
+        )
+        process.start()
+        child_end.close()
+        connections[partition.name] = parent_end
+        processes.append(process)
+
+    reports = dict()
+    try:
+        while len(reports) < len(partitions):
+            inboxes: Dict[str, List[Tuple[int, Any]]] = {name: list() for name in names}
+            for name, connection in connections.items():
+                kind, content = connection.recv()
+                if kind == "report":
+                    reports[name] = content
+                    continue
+                for target, tick, message in content:
+                    inboxes[target].append((tick, message))
+            if reports:
+                continue
+            for name, connection in connections.items():
+                connection.send(sorted(inboxes[name], key=lambda item: item[0]))
+            logger.debug(
+                f"Time window exchanged {sum(len(inbox) for inbox in inboxes.values())} messages."
+            )
+    except EOFError:
+        raise RuntimeError("A partition process terminated unexpectedly.")
+    finally:
+        for process in processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+    return reports
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from . import _np as np, _require_numpy, logger
+from .event import Event
+from .universe import Mundus
+
+if TYPE_CHECKING:
+    from .entity import Entity
+
+
+class Population:
+
+    def __init__(
+        self, fields: Dict[str, Any], capacity: int = 1024, label: Optional[str] = None
+    ) -> None:
+        """Create a population which keeps the state of many homogeneous entities in numpy arrays.
+
+        Args:
+            fields (Dict[str, Any]): the name and default value of each per entity state, the array type is taken from the default value.
+            capacity (int, optional): the initial number of slots, the arrays grow when more entities join. Defaults to 1024.
+            label (Optional[str], optional): short description of the population. Defaults to None.
+        """
+        _require_numpy("populations")
+        if capacity < 1:
+            raise ValueError("Capacity of the population cannot be less than 1.")
+        self._label = label
+        self._defaults = dict(fields)
+        self._fields = {
+            name: np.full(capacity, default, dtype=np.asarray(default).dtype)
+            for name, default in fields.items()
+        }
+        self._active = np.zeros(capacity, dtype=bool)
+        self._slots: Dict[Entity, int] = dict()
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._size = 0
+
+    def __str__(self) -> str:
+        """Return the label of the population if it exists, otherwise return the id of the population."""
+        if self.label is None:
+            return f"Population {id(self)}"
+        return self.label
+
+    def __getitem__(self, field: str):
+        """Return the array of the given state, only the slots marked in active belong to living entities."""
+        return self._fields[field]
+
+    def join(self, entity: Entity, **state: Any) -> int:
+        """Add the entity to the population with the given initial state and return its slot. The entity is only active between its creation and termination."""
+        if entity.terminated:
+            raise ValueError(f"{entity} already terminated, cannot join {self}.")
+        if entity in self._slots:
+            raise ValueError(f"{entity} already joined {self}.")
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        for name, array in self._fields.items():
+            array[slot] = state.get(name, self._defaults[name])
+        self._slots[entity] = slot
+        entity.populations.append(self)
+        if entity.created:
+            self._activate(entity)
+        logger.debug(f"{entity} joined {self} at slot {slot}.")
+        return slot
+
+    def index(self, entity: Entity) -> int:
+        """Return the slot of the entity."""
+        return self._slots[entity]
+
+    def event(
+        self,
+        at: float | Event,
+        till: float | Event,
+        step: float | Callable[[], float] = Mundus.time_step,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ):
+        """Decorator to add one event for the whole population, the action is called with the population once per step while any entity is active."""
+
+        def _event(action: Callable[[Population], Any]) -> Event:
+
+            def __event():
+                if self._size > 0:
+                    action(self)
+
+            return Event(
+                at=at,
+                till=till,
+                step=step,
+                action=__event,
+                label=label,
+                priority=priority,
+            )
+
+        return _event
+
+    def _activate(self, entity: Entity) -> None:
+        """Mark the entity as active, called when the entity is created."""
+        slot = self._slots[entity]
+        if not self._active[slot]:
+            self._active[slot] = True
+            self._size += 1
+
+    def _leave(self, entity: Entity) -> None:
+        """Remove the entity and free its slot, called when the entity is terminated."""
+        slot = self._slots.pop(entity)
+        if self._active[slot]:
+            self._active[slot] = False
+            self._size -= 1
+        self._free.append(slot)
+        logger.debug(f"{entity} left {self}.")
+
+    def _grow(self) -> None:
+        """Double the number of slots."""
+        capacity = self.capacity
+        for name, array in self._fields.items():
+            grown = np.full(capacity * 2, self._defaults[name], dtype=array.dtype)
+            grown[:capacity] = array
+            self._fields[name] = grown
+        active = np.zeros(capacity * 2, dtype=bool)
+        active[:capacity] = self._active
+        self._active = active
+        self._free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    @property
+    def label(self) -> Optional[str]:
+        """Short description of the population."""
+        return self._label
+
+    @property
+    def active(self):
+        """The mask of slots occupied by created and not yet terminated entities."""
+        return self._active
+
+    @property
+    def size(self) -> int:
+        """The number of active entities."""
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """The current number of slots."""
+        return len(self._active)
+
+    @property
+    def entities(self) -> List[Entity]:
+        """The entities which joined the population and are not terminated yet."""
+        return list(self._slots)
@@ -1,7 +1,10 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
 from math import inf
-from typing import List, Tuple
+from typing import Callable, List, Optional, Tuple
 
 from . import logger
+from .condition import Condition
 from .entity import Entity
 
 
@@ -21,6 +24,10 @@ class Resource:
         else:
             self._usage = usage
         self._users: List[Tuple[Entity, float]] = list()
+        # sorted threshold indexes of conditions waiting for the level to fall below or rise above a value
+        self._below: List[Tuple[float, int, Condition]] = list()
+        self._above: List[Tuple[float, int, Condition]] = list()
+        self._sequence = count()
 
     def distribute(self, user: Entity, amount: float = inf) -> bool:
         """Distribute the given amount of resource to the user."""
@@ -30,8 +37,10 @@ class Resource:
                 index = existing_users.index(user)
                 self._users[index] = (user, self.users[index][1] + self.level)
                 self._usage += self.level
+                self._notify()
             else:
                 self._usage += self.level
+                self._notify()
                 self.users.append((user, self.level))
                 user.occupied_resources.append(self)
             logger.debug(f"{self} distributed all available resource to {user}.")
@@ -39,6 +48,7 @@ class Resource:
 
         if self.level > amount:
             self._usage += amount
+            self._notify()
             existing_users = [user[0] for user in self.users]
             if user in existing_users:
                 index = existing_users.index(user)
@@ -55,8 +65,10 @@ class Resource:
                 index = existing_users.index(user)
                 self._users[index] = (user, self.users[index][1] + self.level)
                 self._usage += self.level
+                self._notify()
             else:
                 self._usage += self.level
+                self._notify()
                 self.users.append((user, self.level))
                 user.occupied_resources.append(self)
             logger.debug(f"{self} distributed all available resource to {user}.")
@@ -69,6 +81,7 @@ class Resource:
             if user in existing_users:
                 index = existing_users.index(user)
                 self._usage -= self.users[index][1]
+                self._notify()
                 self.users.pop(index)
                 user.occupied_resources.remove(self)
                 logger.debug(f"{self} collected all occupied resource from {user}.")
@@ -82,11 +95,13 @@ class Resource:
             index = existing_users.index(user)
             if self.users[index][1] > amount:
                 self._usage -= amount
+                self._notify()
                 self._users[index] = (user, self.users[index][1] - amount)
                 return True
             else:
                 logger.warn(f"{self} cannot collect {amount} from {user}. Not enough resource occupied by the user.")
                 self._usage -= self.users[index][1]
+                self._notify()
                 self.users.pop(index)
                 user.occupied_resources.remove(self)
                 logger.debug(f"{self} collected all occupied resource from {user}.")
@@ -95,9 +110,55 @@ class Resource:
             logger.warn(f"{self} cannot collect resource from non-user {user}.")
             return False
 
+    def when_below(
+        self,
+        level: float,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> Condition:
+        """Return a condition triggered once the level of the resource falls below the given level."""
+        condition = Condition(action, label or f"{self} below {level}", priority)
+        if self.level < level:
+            condition._trigger()
+        else:
+            insort(self._below, (level, next(self._sequence), condition))
+        return condition
+
+    def when_above(
+        self,
+        level: float,
+        action: Optional[Callable] = None,
+        label: Optional[str] = None,
+        priority: int = 0,
+    ) -> Condition:
+        """Return a condition triggered once the level of the resource rises above the given level."""
+        condition = Condition(action, label or f"{self} above {level}", priority)
+        if self.level > level:
+            condition._trigger()
+        else:
+            insort(self._above, (level, next(self._sequence), condition))
+        return condition
+
+    def _notify(self) -> None:
+        """Trigger the conditions whose threshold has been crossed by the current level."""
+        if self._below and self._below[-1][0] > self.level:
+            index = bisect_right(self._below, (self.level, inf))
+            triggered = self._below[index:]
+            del self._below[index:]
+            for _, _, condition in triggered:
+                condition._trigger()
+        if self._above and self._above[0][0] < self.level:
+            index = bisect_left(self._above, (self.level, -1))
+            triggered = self._above[:index]
+            del self._above[:index]
+            for _, _, condition in triggered:
+                condition._trigger()
+
     def reset(self) -> None:
         """Reset the resource level and users."""
         self._usage = 0.0
+        self._notify()
         for user in self.users:
             user[0].occupied_resources.remove(self)
         self._users.clear()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from math import exp, lgamma, log, sqrt
+from typing import Callable, Dict, Optional, Tuple
+
+from . import _np as np, _require_numpy
+from .monitor import Monitor
+from .universe import Mundus
+
+
+class StopCondition(ABC):
+
+    def __init__(self, period: float = 1) -> None:
+        """Create a condition which can end a simulation before its horizon, it is checked every period.
+
+        Args:
+            period (float, optional): the time between two checks. Defaults to 1.
+        """
+        if period <= 0:
+            raise ValueError("Period of the stop condition must be greater than 0.")
+        self._period = period
+
+    @abstractmethod
+    def check(self) -> Optional[str]:
+        """Return the reason to stop the simulation, or None to continue."""
+        pass
+
+    @property
+    def period(self) -> float:
+        """The time between two checks."""
+        return self._period
+
+
+class Predicate(StopCondition):
+
+    def __init__(
+        self,
+        predicate: Callable[[], bool],
+        period: float = 1,
+        label: Optional[str] = None,
+    ) -> None:
+        """Stop the simulation once the predicate returns True.
+
+        Args:
+            predicate (Callable[[], bool]): returns True when the simulation should stop.
+            period (float, optional): the time between two checks. Defaults to 1.
+            label (Optional[str], optional): short description used in the stop reason. Defaults to None.
+        """
+        super().__init__(period)
+        self._predicate = predicate
+        self._label = label
+
+    def check(self) -> Optional[str]:
+        """Return the reason to stop the simulation, or None to continue."""
+        if self._predicate():
+            return f"{self._label or 'Predicate'} satisfied."
+        return None
+
+
+class SteadyState(StopCondition):
+
+    def __init__(
+        self,
+        monitor: Monitor | str,
+        batch: int = 5,
+        min_batches: int = 20,
+        period: float = 1,
+    ) -> None:
+        """Stop the simulation once the monitored metric reaches steady state, detected with the MSER-5 rule.
+
+        The samples are grouped in batches, the truncation point minimizing the marginal standard error of the remaining batch means is the end of the warm-up. The metric is considered steady once that point lies in the first half of the batches.
+
+        Args:
+            monitor (Monitor | str): the monitor of the metric, or its name.
+            batch (int, optional): the number of samples per batch. Defaults to 5.
+            min_batches (int, optional): the minimum number of batches before steady state can be detected. Defaults to 20.
+            period (float, optional): the time between two checks. Defaults to 1.
+        """
+        _require_numpy("steady state detection")
+        if batch < 1:
+            raise ValueError("Batch size cannot be less than 1.")
+        if min_batches < 4:
+            raise ValueError("Steady state detection needs at least 4 batches.")
+        super().__init__(period)
+        self._monitor = monitor
+        self._batch = batch
+        self._min_batches = min_batches
+        self._warmup: Optional[float] = None
+
+    def _truncate(self) -> Optional[Tuple[int, object]]:
+        """Return the MSER truncation point in batches and the batch means, or None if not steady yet."""
+        monitor = self.monitor
+        batches = monitor.samples // self._batch
+        if batches < self._min_batches:
+            return None
+        means = (
+            monitor.values[: batches * self._batch]
+            .reshape(batches, self._batch)
+            .mean(axis=1)
+        )
+        # suffix sums give the statistic of every truncation point in one pass
+        remaining = np.arange(batches, 0, -1)
+        sums = np.cumsum(means[::-1])[::-1]
+        squares = np.cumsum((means * means)[::-1])[::-1]
+        errors = (squares - sums * sums / remaining) / (remaining * remaining)
+        truncation = int(np.argmin(errors[: batches - 1]))
+        if truncation >= batches // 2:
+            return None
+        self._warmup = float(monitor.times[truncation * self._batch])
+        return truncation, means[truncation:]
+
+    def check(self) -> Optional[str]:
+        """Return the reason to stop the simulation, or None to continue."""
+        if self._truncate() is None:
+            return None
+        return f"{self.monitor.name} reached steady state, warm-up ends at {self.warmup}."
+
+    @property
+    def monitor(self) -> Monitor:
+        """The monitor of the metric."""
+        if isinstance(self._monitor, str):
+            return Mundus.monitors[self._monitor]
+        return self._monitor
+
+    @property
+    def warmup(self) -> Optional[float]:
+        """The end of the warm-up period, once steady state has been detected."""
+        return self._warmup
+
+
+class Precision(SteadyState):
+
+    def __init__(
+        self,
+        monitor: Monitor | str,
+        half_width: float,
+        confidence: float = 0.95,
+        relative: bool = False,
+        batch: int = 5,
+        min_batches: int = 20,
+        period: float = 1,
+    ) -> None:
+        """Stop the simulation once the confidence interval of the monitored metric after the warm-up is narrow enough.
+
+        The warm-up is truncated with the MSER-5 rule, the confidence interval is computed from the remaining batch means with the Student t distribution, so the batch should be long enough for the batch means to be nearly independent.
+
+        Args:
+            monitor (Monitor | str): the monitor of the metric, or its name, for example the utilization of a resource.
+            half_width (float): the target half width of the confidence interval.
+            confidence (float, optional): the confidence level of the interval. Defaults to 0.95.
+            relative (bool, optional): whether the half width is relative to the mean. Defaults to False.
+            batch (int, optional): the number of samples per batch. Defaults to 5.
+            min_batches (int, optional): the minimum number of batches before the interval is computed. Defaults to 20.
+            period (float, optional): the time between two checks. Defaults to 1.
+        """
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be between 0 and 1.")
+        super().__init__(monitor, batch, min_batches, period)
+        self._half_width = half_width
+        self._relative = relative
+        self._confidence = confidence
+        self._quantiles: Dict[int, float] = dict()
+        self._mean: Optional[float] = None
+        self._achieved: Optional[float] = None
+
+    def check(self) -> Optional[str]:
+        """Return the reason to stop the simulation, or None to continue."""
+        truncated = self._truncate()
+        if truncated is None:
+            return None
+        _, means = truncated
+        if len(means) < 2:
+            return None
+        degrees = len(means) - 1
+        if degrees not in self._quantiles:
+            self._quantiles[degrees] = _t_quantile((1 + self._confidence) / 2, degrees)
+        self._mean = float(means.mean())
+        self._achieved = (
+            self._quantiles[degrees] * float(means.std(ddof=1)) / sqrt(len(means))
+        )
+        target = self._half_width * abs(self._mean) if self._relative else self._half_width
+        if self._achieved > target:
+            return None
+        return f"{self.monitor.name} mean {self._mean} reached half width {self._achieved} after warm-up ending at {self.warmup}."
+
+    @property
+    def mean(self) -> Optional[float]:
+        """The mean of the metric after the warm-up at the last check."""
+        return self._mean
+
+    @property
+    def achieved_half_width(self) -> Optional[float]:
+        """The half width of the confidence interval at the last check."""
+        return self._achieved
+
+
+def _incomplete_beta(a: float, b: float, x: float) -> float:
+    """Return the regularized incomplete beta function, evaluated with its continued fraction."""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1 - _incomplete_beta(b, a, 1 - x)
+    front = exp(lgamma(a + b) - lgamma(a) - lgamma(b) + a * log(x) + b * log(1 - x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1 - (a + b) * x / (a + 1)
+    d = 1 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 300):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1 + numerator * d
+            d = 1 / (d if abs(d) > tiny else tiny)
+            c = 1 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1) < 1e-15:
+            break
+    return front * fraction
+
+
+def _t_distribution(t: float, degrees: int) -> float:
+    """Return the cumulative distribution of the Student t distribution at a value not below its median."""
+    return 1 - _incomplete_beta(degrees / 2, 0.5, degrees / (degrees + t * t)) / 2
+
+
+def _t_quantile(probability: float, degrees: int) -> float:
+    """Return the quantile of the Student t distribution above its median, found by bisection on its cumulative distribution."""
+    low, high = 0.0, 1.0
+    while _t_distribution(high, degrees) < probability:
+        low, high = high, 2 * high
+    for _ in range(100):
+        middle = (low + high) / 2
+        if _t_distribution(middle, degrees) < probability:
+            low = middle
+        else:
+            high = middle
+    return (low + high) / 2
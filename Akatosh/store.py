@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import deque
+from itertools import count
+from math import inf
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import logger
+from .universe import Mundus
+
+if TYPE_CHECKING:
+    from .entity import Entity
+
+_NOTHING = object()
+
+
+class Store:
+
+    def __init__(self, capacity: float = inf, label: Optional[str] = None) -> None:
+        """Create a store which holds individual items, served first in first out.
+
+        Args:
+            capacity (float, optional): the maximum number of items that can be stored. Defaults to inf.
+            label (Optional[str], optional): short description of the store. Defaults to None.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity of the store cannot be less than 1.")
+        self._capacity = capacity
+        self._label = label
+        self._items: Deque[Any] = deque()
+        self._getters: Deque[Tuple[Entity, Optional[Callable[[Any], bool]], asyncio.Future]] = deque()
+        self._putters: Deque[Tuple[Entity, Any, asyncio.Future]] = deque()
+        self._waiting: Dict[Entity, int] = dict()
+        self._puts = 0
+        self._gets = 0
+        self._peak_level = 0
+        self._level_area = 0
+        self._created = Mundus.ticks
+        self._last_change = Mundus.ticks
+
+    def __str__(self) -> str:
+        """Return the label of the store if it exists, otherwise return the id of the store."""
+        if self.label is None:
+            return f"Store {id(self)}"
+        return self.label
+
+    async def put(self, user: Entity, item: Any) -> None:
+        """Put an item into the store, waiting until there is space for it."""
+        await self._put(user, item)
+
+    async def get(self, user: Entity) -> Any:
+        """Get the next item from the store, waiting until one is available."""
+        return await self._get(user, None)
+
+    def withdraw(self, user: Entity) -> None:
+        """Withdraw all waiting puts and gets of the user, called when the user is terminated."""
+        if user not in self._waiting:
+            return
+        for waiting in (self._getters, self._putters):
+            for request in [request for request in waiting if request[0] is user]:
+                waiting.remove(request)
+                request[2].cancel()
+        del self._waiting[user]
+        user.stores.remove(self)
+        logger.debug(f"{self} withdrew all requests of {user}.")
+
+    async def _put(self, user: Entity, entry: Any) -> None:
+        """Put the entry into the store, or queue the user if the store is full."""
+        if self.level < self.capacity and not self._putters:
+            self._store(entry)
+            self._dispatch()
+            logger.debug(f"{user} put an item into {self}.")
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._putters.append((user, entry, future))
+        self._wait(user)
+        logger.debug(f"{user} is waiting to put an item into {self}.")
+        try:
+            await future
+        except asyncio.CancelledError:
+            self._abandon(self._putters, future)
+            raise
+
+    async def _get(self, user: Entity, filter: Optional[Callable[[Any], bool]]) -> Any:
+        """Get an item accepted by the filter, or queue the user if there is none."""
+        entry = self._take(filter) if self.level > 0 else _NOTHING
+        if entry is not _NOTHING:
+            self._admit()
+            logger.debug(f"{user} got an item from {self}.")
+            return self._item(entry)
+        future = asyncio.get_running_loop().create_future()
+        self._getters.append((user, filter, future))
+        self._wait(user)
+        logger.debug(f"{user} is waiting to get an item from {self}.")
+        try:
+            return self._item(await future)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the item was handed out in the same time step the getter was cancelled
+                self._restore(future.result())
+            else:
+                self._abandon(self._getters, future)
+            raise
+
+    def _wait(self, user: Entity) -> None:
+        """Register the user as waiting on the store, so it is withdrawn on termination."""
+        if user not in self._waiting:
+            self._waiting[user] = 0
+            user.stores.append(self)
+        self._waiting[user] += 1
+
+    def _served(self, user: Entity) -> None:
+        """Unregister one waiting request of the user."""
+        self._waiting[user] -= 1
+        if self._waiting[user] == 0:
+            del self._waiting[user]
+            user.stores.remove(self)
+
+    def _abandon(self, waiting: Deque[Tuple[Any, Any, asyncio.Future]], future: asyncio.Future) -> None:
+        """Remove the request of a cancelled waiter, unless it has already been withdrawn."""
+        for request in waiting:
+            if request[2] is future:
+                waiting.remove(request)
+                self._served(request[0])
+                logger.debug(f"{self} dropped the cancelled request of {request[0]}.")
+                return
+
+    def _restore(self, entry: Any) -> None:
+        """Put back an entry which was taken for a getter that was cancelled before receiving it."""
+        self._record()
+        self._items.appendleft(entry)
+        self._gets -= 1
+        logger.debug(f"{self} restored an item of a cancelled getter.")
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand out items to the waiting getters in order."""
+        while self._getters and self.level > 0:
+            user, filter, future = self._getters.popleft()
+            if future.done():
+                continue
+            future.set_result(self._take(filter))
+            self._served(user)
+            logger.debug(f"{self} woke {user} with an item.")
+
+    def _admit(self) -> None:
+        """Move the items of the waiting putters into the free space."""
+        admitted = False
+        while self._putters and self.level < self.capacity:
+            user, entry, future = self._putters.popleft()
+            if future.done():
+                continue
+            self._store(entry)
+            future.set_result(None)
+            self._served(user)
+            admitted = True
+            logger.debug(f"{self} admitted an item from {user}.")
+        if admitted:
+            self._dispatch()
+
+    def _record(self) -> None:
+        """Accumulate the time weighted level before the level changes."""
+        self._level_area += self.level * (Mundus.ticks - self._last_change)
+        self._last_change = Mundus.ticks
+
+    def _store(self, entry: Any) -> None:
+        """Add the entry to the items."""
+        self._record()
+        self._items.append(entry)
+        self._puts += 1
+        self._peak_level = max(self._peak_level, self.level)
+
+    def _take(self, filter: Optional[Callable[[Any], bool]]) -> Any:
+        """Remove and return the next entry."""
+        self._record()
+        self._gets += 1
+        return self._items.popleft()
+
+    def _item(self, entry: Any) -> Any:
+        """Return the item of an entry."""
+        return entry
+
+    @property
+    def label(self) -> Optional[str]:
+        """Short description of the store."""
+        return self._label
+
+    @property
+    def capacity(self) -> float:
+        """The maximum number of items that can be stored."""
+        return self._capacity
+
+    @property
+    def level(self) -> int:
+        """The current number of items in the store."""
+        return len(self._items)
+
+    @property
+    def items(self) -> List[Any]:
+        """The items in the store, in the order they will be served."""
+        return list(self._items)
+
+    @property
+    def waiting_getters(self) -> int:
+        """The number of users waiting to get an item."""
+        return len(self._getters)
+
+    @property
+    def waiting_putters(self) -> int:
+        """The number of users waiting to put an item."""
+        return len(self._putters)
+
+    @property
+    def puts(self) -> int:
+        """The number of items put into the store."""
+        return self._puts
+
+    @property
+    def gets(self) -> int:
+        """The number of items taken from the store."""
+        return self._gets
+
+    @property
+    def peak_level(self) -> int:
+        """The highest number of items the store has held."""
+        return self._peak_level
+
+    @property
+    def mean_level(self) -> float:
+        """The time weighted average number of items in the store since it was created."""
+        if Mundus.ticks == self._created:
+            return float(self.level)
+        area = self._level_area + self.level * (Mundus.ticks - self._last_change)
+        return area / (Mundus.ticks - self._created)
+
+
+class PriorityStore(Store):
+
+    def __init__(self, capacity: float = inf, label: Optional[str] = None) -> None:
+        """Create a store which serves the item with the lowest priority value first, items with the same priority are served first in first out.
+
+        Args:
+            capacity (float, optional): the maximum number of items that can be stored. Defaults to inf.
+            label (Optional[str], optional): short description of the store. Defaults to None.
+        """
+        super().__init__(capacity, label)
+        self._items: List[Tuple[float, int, Any]] = list()
+        self._sequence = count()
+
+    async def put(self, user: Entity, item: Any, priority: float = 0) -> None:
+        """Put an item with the given priority into the store, waiting until there is space for it."""
+        await self._put(user, (priority, next(self._sequence), item))
+
+    def _store(self, entry: Tuple[float, int, Any]) -> None:
+        """Add the entry to the heap of items."""
+        self._record()
+        heapq.heappush(self._items, entry)
+        self._puts += 1
+        self._peak_level = max(self._peak_level, self.level)
+
+    def _take(self, filter: Optional[Callable[[Any], bool]]) -> Tuple[float, int, Any]:
+        """Remove and return the entry with the lowest priority value."""
+        self._record()
+        self._gets += 1
+        return heapq.heappop(self._items)
+
+    def _item(self, entry: Tuple[float, int, Any]) -> Any:
+        """Return the item of an entry without its priority."""
+        return entry[2]
+
+    def _restore(self, entry: Tuple[float, int, Any]) -> None:
+        """Put back an entry which was taken for a getter that was cancelled before receiving it."""
+        self._record()
+        heapq.heappush(self._items, entry)
+        self._gets -= 1
+        logger.debug(f"{self} restored an item of a cancelled getter.")
+        self._dispatch()
+
+    @property
+    def items(self) -> List[Any]:
+        """The items in the store, in the order they will be served."""
+        return [entry[2] for entry in sorted(self._items)]
+
+
+class FilterStore(Store):
+
+    def __init__(self, capacity: float = inf, label: Optional[str] = None) -> None:
+        """Create a store where each get may ask for the first item accepted by a filter.
+
+        Args:
+            capacity (float, optional): the maximum number of items that can be stored. Defaults to inf.
+            label (Optional[str], optional): short description of the store. Defaults to None.
+        """
+        super().__init__(capacity, label)
+
+    async def get(
+        self, user: Entity, filter: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """Get the first item accepted by the filter, waiting until one is available."""
+        return await self._get(user, filter)
+
+    def _dispatch(self) -> None:
+        """Hand out items to every waiting getter whose filter accepts one of them."""
+        remaining: Deque[Tuple[Entity, Optional[Callable[[Any], bool]], asyncio.Future]] = deque()
+        while self._getters:
+            request = self._getters.popleft()
+            user, filter, future = request
+            if future.done():
+                continue
+            item = self._take(filter) if self.level > 0 else _NOTHING
+            if item is _NOTHING:
+                remaining.append(request)
+                continue
+            future.set_result(item)
+            self._served(user)
+            logger.debug(f"{self} woke {user} with an item.")
+        self._getters = remaining
+
+    def _take(self, filter: Optional[Callable[[Any], bool]]) -> Any:
+        """Remove and return the first item accepted by the filter."""
+        for index, item in enumerate(self._items):
+            if filter is None or filter(item):
+                self._record()
+                self._gets += 1
+                del self._items[index]
+                return item
+        return _NOTHING
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import zlib
+from bisect import bisect_right
+from itertools import accumulate
+from math import exp
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import _np as np, _require_numpy
+
+
+class Stream:
+
+    _KINDS = ("random", "standard_exponential", "standard_normal")
+
+    def __init__(self, name: str, seed: int = 0, block_size: int = 1024) -> None:
+        """Create a named random stream which draws variates in pre-generated blocks.
+
+        Streams with the same name and seed always produce the same sequence, so the same stream used in two scenarios gives common random numbers. Uniform, exponential and normal variates each come from their own sub-stream of standard variates which are scaled at draw time, so drawing one distribution never shifts the values of another.
+
+        Args:
+            name (str): the name of the stream, used to derive an independent seed.
+            seed (int, optional): the base seed shared by all streams of a run. Defaults to 0.
+            block_size (int, optional): how many standard variates are generated at once per sub-stream. Defaults to 1024.
+        """
+        _require_numpy("random streams")
+        if block_size < 1:
+            raise ValueError("Block size cannot be less than 1.")
+        self._name = name
+        self._seed = seed
+        self._block_size = block_size
+        self.reset()
+
+    def __str__(self) -> str:
+        """Return the name of the stream."""
+        return f"Stream {self.name}"
+
+    def _draw(self, kind: str) -> float:
+        """Hand out the next standard variate of the given kind, generating a new block when exhausted."""
+        block, index = self._blocks[kind]
+        if index >= len(block):
+            block = getattr(self._generators[kind], kind)(self.block_size).tolist()
+            index = 0
+        self._blocks[kind] = (block, index + 1)
+        return block[index]
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        """Draw a uniform variate between low and high."""
+        return low + (high - low) * self._draw("random")
+
+    def exponential(self, mean: float) -> float:
+        """Draw an exponential variate with the given mean."""
+        return mean * self._draw("standard_exponential")
+
+    def normal(self, mean: float, std: float) -> float:
+        """Draw a normal variate with the given mean and standard deviation."""
+        return mean + std * self._draw("standard_normal")
+
+    def lognormal(self, mean: float, sigma: float) -> float:
+        """Draw a lognormal variate, mean and sigma are the parameters of the underlying normal distribution."""
+        return exp(mean + sigma * self._draw("standard_normal"))
+
+    def empirical(
+        self, values: Sequence[float], weights: Optional[Sequence[float]] = None
+    ) -> float:
+        """Draw one of the observed values, optionally weighted."""
+        values = list(values)
+        if weights is None:
+            index = int(self._draw("random") * len(values))
+        else:
+            cumulative = list(accumulate(weights))
+            index = bisect_right(cumulative, self._draw("random") * cumulative[-1])
+        return values[min(index, len(values) - 1)]
+
+    def reset(self) -> None:
+        """Restart the stream from the beginning of its sequence."""
+        sequences = np.random.SeedSequence(
+            [self.seed, zlib.crc32(self.name.encode())]
+        ).spawn(len(self._KINDS))
+        self._generators = {
+            kind: np.random.default_rng(sequence)
+            for kind, sequence in zip(self._KINDS, sequences)
+        }
+        self._blocks: Dict[str, Tuple[List[float], int]] = {
+            kind: (list(), 0) for kind in self._KINDS
+        }
+
+    @property
+    def name(self) -> str:
+        """The name of the stream."""
+        return self._name
+
+    @property
+    def seed(self) -> int:
+        """The base seed of the stream."""
+        return self._seed
+
+    @property
+    def block_size(self) -> int:
+        """How many standard variates are generated at once per sub-stream."""
+        return self._block_size
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import csv
+import heapq
 import logging
 import time
-from typing import TYPE_CHECKING, List
+import weakref
+from math import inf
+from itertools import count
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from . import logger
+from .wheel import TimingWheel
 
 if TYPE_CHECKING:
     from .event import Event
+    from .monitor import Monitor
+    from .stopping import StopCondition
+    from .stream import Stream
 
 
 class Universe:
@@ -24,7 +33,9 @@ class Universe:
         self._time_resolution = 3
         self._time_scale = 1
         self._time_step = round(1 / pow(10, self.time_resolution), self.time_resolution)
-        self._time = 0
+        self._ticks = 0
+        self._ticks_per_second = pow(10, self.time_resolution)
+        self._realtime_carry = 0.0
         self._simulation_start_time = 0
         self._simulation_end_time = 0
         self._realtime = False
@@ -32,22 +43,87 @@ class Universe:
         self._max_event_priority = 0
         self._pending_events: List[Event] = list()
         self._paused = False
-
-    def simulate(self, till: float):
-        """Simulate the universe until the given time."""
+        self._seed = 0
+        self._streams: Dict[str, Stream] = dict()
+        self._scheduler = "task"
+        self._live_events = 0
+        self._retired_events = 0
+        self._live_entities = 0
+        self._retired_entities = 0
+        self._monitors: Dict[str, Monitor] = dict()
+        self._monitor_due: Dict[int, List[Monitor]] = dict()
+        self._monitor_ticks: List[int] = list()
+        self._stop_reason: Optional[str] = None
+        self._sleepers: Dict[Event, int | float] = dict()
+        self._wake_ticks: List[Tuple[int, int, weakref.ref]] = list()
+        self._sleep_sequence = count()
+        self._woken: Set[Event] = set()
+        self._wheel: Optional[TimingWheel] = None
+
+    def simulate(
+        self,
+        till: float,
+        stop: Optional[
+            StopCondition | Callable[[], bool] | Sequence[StopCondition | Callable[[], bool]]
+        ] = None,
+    ):
+        """Simulate the universe until the given time, or until one of the stop conditions is met. The reason is available as stop_reason afterwards.
+
+        Args:
+            till (float): when the simulation ends at the latest.
+            stop (Optional[StopCondition | Callable[[], bool] | Sequence[StopCondition | Callable[[], bool]]], optional): conditions which end the simulation early, a callable is checked every simulated second. Defaults to None.
+        """
+        if stop is None:
+            stop = list()
+        elif callable(stop) or not isinstance(stop, Sequence):
+            stop = [stop]
+        if any(not hasattr(condition, "check") for condition in stop):
+            from .stopping import Predicate
+
+            stop = [
+                condition if hasattr(condition, "check") else Predicate(condition)
+                for condition in stop
+            ]
 
         # Define the flow of time
         async def time_flow():
             """Flow of time."""
             self._simulation_start_time = time.perf_counter()
-            while self.time < till:
+            self._stop_reason = None
+            start_tick = self.ticks
+            till_tick = self.to_ticks(till)
+            checks = [
+                [self.ticks + max(1, self.to_ticks(condition.period)), condition]
+                for condition in stop
+            ]
+            if till_tick != inf:
+                for monitor in self.monitors.values():
+                    # periods shorter than a tick are sampled once per tick
+                    period = max(1, self.to_ticks(monitor.period))
+                    monitor.reserve(
+                        monitor.samples + (till_tick - self.ticks) // period + 1
+                    )
+            while self.ticks < till_tick:
                 if self.paused:
                     await asyncio.sleep(0)
                     continue
                 logger.debug(f"Simulation time:\t{self.time}")
                 for event in self.pending_events:
-                    asyncio.create_task(event())
+                    if event.ended:
+                        continue
+                    if self._wheel is not None and event._wheelable():
+                        event._prepare()
+                        event._wheeled = True
+                        self._wheel.schedule(
+                            event, min(event._at_tick, event._till_tick)
+                        )
+                    else:
+                        event._task = asyncio.create_task(event())
                 self.pending_events.clear()
+                if self._wheel is not None:
+                    self._wheel.advance(self.ticks)
+                if self._wake_ticks and self._wake_ticks[0][0] <= self.ticks:
+                    self._wake_sleepers()
                 if self.realtime:
                     iteration_start_time = (
                         time.perf_counter() - self.simulation_start_time
@@ -61,14 +137,29 @@ class Universe:
                         logger.debug(
                             f"Current Event Priority: {self.current_event_priority}"
                         )
+                        if self._wheel is not None:
+                            self._wheel.dispatch(self.current_event_priority)
                         await asyncio.sleep(0)
+                        # let the events woken up at this priority run before moving on
+                        while self._woken:
+                            await asyncio.sleep(0)
                         self._current_event_priority += 1
+                    # sample the monitors which are due
+                    if self._monitor_ticks and self._monitor_ticks[0] <= self.ticks:
+                        self._sample_monitors()
                     # finish the iteration
                     iteration_end_time = (
                         time.perf_counter() - self.simulation_start_time
                     )
-                    # update the time
-                    self._time += (iteration_end_time - iteration_start_time) * self.time_scale
+                    # update the time, keeping the fraction of a tick for the next iteration
+                    self._realtime_carry += (
+                        (iteration_end_time - iteration_start_time)
+                        * self.time_scale
+                        * self._ticks_per_second
+                    )
+                    elapsed_ticks = int(self._realtime_carry)
+                    self._realtime_carry -= elapsed_ticks
+                    self._ticks += elapsed_ticks
                     logger.debug(
                         f"Iteration finished at Real Time: {iteration_end_time:0.6f}"
                     )
@@ -84,17 +175,39 @@ class Universe:
                         logger.debug(
                             f"Current Event Priority: {self.current_event_priority}"
                         )
+                        if self._wheel is not None:
+                            self._wheel.dispatch(self.current_event_priority)
                         await asyncio.sleep(0)
+                        # let the events woken up at this priority run before moving on
+                        while self._woken:
+                            await asyncio.sleep(0)
                         self._current_event_priority += 1
+                    # sample the monitors which are due
+                    if self._monitor_ticks and self._monitor_ticks[0] <= self.ticks:
+                        self._sample_monitors()
                     # wait for the time step
-                    self._time += self.time_step
-                    self._time = round(self.time, self.time_resolution)
+                    self._ticks += 1
                     await asyncio.sleep(0)
 
+                # check the stop conditions which are due
+                for check in checks:
+                    if check[0] <= self.ticks:
+                        check[0] = self.ticks + max(1, self.to_ticks(check[1].period))
+                        self._stop_reason = check[1].check()
+                        if self._stop_reason is not None:
+                            break
+                if self._stop_reason is not None:
+                    break
+
             self._simulation_end_time = time.perf_counter()
-            if self.realtime:
+            if self._stop_reason is None:
+                self._stop_reason = f"Reached the end time {till}."
+            else:
+                logger.info(f"Simulation stopped at {self.time}: {self.stop_reason}")
+            simulated = self.to_time(self.ticks - start_tick)
+            if self.realtime and simulated > 0:
                 logger.info(
-                    f"Simulation completed in {round(self.simulation_end_time - self.simulation_start_time, 6)} seconds, exceeding real time by {round(((self.simulation_end_time - self.simulation_start_time - till)/till)*100,2)}%."
+                    f"Simulation completed in {round(self.simulation_end_time - self.simulation_start_time, 6)} seconds, exceeding real time by {round(((self.simulation_end_time - self.simulation_start_time - simulated)/simulated)*100,2)}%."
                 )
 
         return time_flow()
@@ -132,6 +245,101 @@ class Universe:
         self._paused = False
         logger.debug(f"Simulation resumed at {self.time}.")
 
+    def monitor(
+        self, name: str, gauge: Callable[[], float], period: float = 1
+    ) -> Monitor:
+        """Register a gauge which is sampled every period, starting from the current time. All monitors due in a time step are sampled in one pass, without an event per monitor."""
+        if name in self._monitors:
+            raise ValueError(f"Monitor {name} already exists.")
+        from .monitor import Monitor
+
+        monitor = Monitor(name, gauge, period)
+        self._monitors[name] = monitor
+        self._schedule_monitor(monitor, self.ticks)
+        return monitor
+
+    def export_monitors(self, path: str) -> None:
+        """Write the samples of all monitors to a CSV file with one row per sample."""
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["monitor", "time", "value"])
+            for monitor in self.monitors.values():
+                writer.writerows(
+                    (monitor.name, time, value)
+                    for time, value in zip(monitor.times.tolist(), monitor.values.tolist())
+                )
+
+    def _sleep(self, event: Event, tick: int | float) -> None:
+        """Keep a sleeping event, for example a paused one, and wake it up at the given tick."""
+        self._sleepers[event] = tick
+        if tick == inf:
+            return
+        # the wake up entries only hold the event weakly, so cancelled sleepers can be collected before their tick
+        heapq.heappush(
+            self._wake_ticks, (tick, next(self._sleep_sequence), weakref.ref(event))
+        )
+        self._compact_wake_ticks()
+
+    def _awake(self, event: Event) -> None:
+        """Forget a sleeping event which has been woken up in another way."""
+        if self._sleepers.pop(event, None) is not None:
+            self._compact_wake_ticks()
+
+    def _compact_wake_ticks(self) -> None:
+        """Drop the outdated wake up entries once they are the majority, for example after many pause and resume cycles."""
+        if len(self._wake_ticks) <= 2 * len(self._sleepers):
+            return
+        self._wake_ticks = [
+            entry
+            for entry in self._wake_ticks
+            if self._sleepers.get(entry[2]()) == entry[0]
+        ]
+        heapq.heapify(self._wake_ticks)
+
+    def _wake_sleepers(self) -> None:
+        """Wake up the sleeping events whose wake up tick has come."""
+        while self._wake_ticks and self._wake_ticks[0][0] <= self.ticks:
+            tick, _, reference = heapq.heappop(self._wake_ticks)
+            event = reference()
+            if event is not None and self._sleepers.get(event) == tick:
+                event._wake()
+
+    def _schedule_monitor(self, monitor: Monitor, tick: int) -> None:
+        """Add the monitor to the bucket of the tick it is due."""
+        if tick not in self._monitor_due:
+            self._monitor_due[tick] = list()
+            heapq.heappush(self._monitor_ticks, tick)
+        self._monitor_due[tick].append(monitor)
+
+    def _sample_monitors(self) -> None:
+        """Sample all monitors which are due at or before the current tick."""
+        while self._monitor_ticks and self._monitor_ticks[0] <= self.ticks:
+            tick = heapq.heappop(self._monitor_ticks)
+            for monitor in self._monitor_due.pop(tick):
+                monitor._sample(self.time)
+                self._schedule_monitor(
+                    monitor,
+                    max(tick + max(1, self.to_ticks(monitor.period)), self.ticks + 1),
+                )
+
+    def to_ticks(self, seconds: float) -> int | float:
+        """Convert a time in seconds to the number of ticks at the current time resolution. Infinity stays infinity."""
+        if seconds == inf:
+            return inf
+        return round(seconds * self._ticks_per_second)
+
+    def to_time(self, ticks: int) -> float:
+        """Convert a number of ticks at the current time resolution to a time in seconds."""
+        return ticks / self._ticks_per_second
+
+    def stream(self, name: str, block_size: int = 1024) -> Stream:
+        """Return the named random stream, creating it from the universe seed if it does not exist yet."""
+        if name not in self._streams:
+            from .stream import Stream
+
+            self._streams[name] = Stream(name, self.seed, block_size)
+        return self._streams[name]
+
     def set_logging_level(self, level: int = logging.DEBUG):
         """Set the logging level. Default is DEBUG."""
         logger.setLevel(level)
@@ -139,7 +347,12 @@ class Universe:
     @property
     def time(self):
         """Return the current time."""
-        return self._time
+        return self._ticks / self._ticks_per_second
+
+    @property
+    def ticks(self):
+        """Return the current time as the number of elapsed time steps."""
+        return self._ticks
 
     @property
     def time_resolution(self):
@@ -153,9 +366,40 @@ class Universe:
         """Set the time resolution. 1 for 0.1s, 2 for 0.01s, 3 for 0.001s, and so on. Default is 3."""
         if value < 0:
             raise ValueError("Time resolution cannot be less than 0.")
+        self._ticks = round(self._ticks * pow(10, value - self._time_resolution))
         self._time_resolution = value
+        self._ticks_per_second = pow(10, value)
         self._time_step = round(1 / pow(10, self.time_resolution), self.time_resolution)
 
+    @property
+    def seed(self):
+        """The base seed of all random streams. Default is 0."""
+        return self._seed
+
+    @seed.setter
+    def seed(self, value: int):
+        """Set the base seed of all random streams, existing streams are discarded."""
+        self._seed = value
+        self._streams.clear()
+
+    @property
+    def streams(self):
+        """The random streams created in the universe."""
+        return self._streams
+
+    @property
+    def scheduler(self):
+        """The scheduler of periodic events, "task" runs every event as its own task, "wheel" drives events with a fixed start, end and synchronous action from a timing wheel. Default is "task"."""
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, value: str):
+        """Set the scheduler of periodic events, it should be selected before the simulation starts."""
+        if value not in ("task", "wheel"):
+            raise ValueError(f"Unknown scheduler {value}, choose 'task' or 'wheel'.")
+        self._scheduler = value
+        self._wheel = TimingWheel(self.ticks) if value == "wheel" else None
+
     @property
     def time_step(self):
         """The time step of the simulation. Default is 0.001s."""
@@ -171,6 +415,36 @@ class Universe:
         """The events that are pending to be executed. Please note that this is not the queue for future events. This is used for start async tasks for the events."""
         return self._pending_events
 
+    @property
+    def stop_reason(self):
+        """Why the last simulation ended."""
+        return self._stop_reason
+
+    @property
+    def monitors(self):
+        """The registered monitors by name."""
+        return self._monitors
+
+    @property
+    def live_events(self):
+        """The number of events which have not ended yet."""
+        return self._live_events
+
+    @property
+    def retired_events(self):
+        """The number of events which have ended or been cancelled."""
+        return self._retired_events
+
+    @property
+    def live_entities(self):
+        """The number of entities which have not been terminated yet."""
+        return self._live_entities
+
+    @property
+    def retired_entities(self):
+        """The number of entities which have been terminated."""
+        return self._retired_entities
+
     @property
     def current_event_priority(self):
         """The current event priority."""
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import heapq
+from itertools import count
+from typing import TYPE_CHECKING, List, Tuple
+
+if TYPE_CHECKING:
+    from .event import Event
+
+
+class TimingWheel:
+
+    def __init__(self, now: int = 0, bits: int = 8, levels: int = 4) -> None:
+        """Create a hierarchical timing wheel which schedules event activations by tick.
+
+        Each level has 2^bits slots, a slot of level i spans 2^(bits*i) ticks. Activations further away than the top level are kept in an overflow list until the top level wraps.
+
+        Args:
+            now (int, optional): the current tick. Defaults to 0.
+            bits (int, optional): the number of bits of each level, the number of slots is 2^bits. Defaults to 8.
+            levels (int, optional): the number of levels. Defaults to 4.
+        """
+        self._now = now
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels: List[List[List[list]]] = [
+            [list() for _ in range(1 << bits)] for _ in range(levels)
+        ]
+        self._overflow: List[list] = list()
+        self._ready: List[Tuple[int, int, int, list]] = list()
+        self._sequence = count()
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of scheduled activations, including cancelled ones not yet discarded."""
+        return self._size
+
+    def schedule(self, event: Event, tick: int) -> None:
+        """Schedule the event to be activated at the given tick, replacing its previous activation. O(1)."""
+        entry = [tick, event]
+        event._wheel_entry = entry
+        self._size += 1
+        self._place(entry)
+
+    def cancel(self, event: Event) -> None:
+        """Cancel the scheduled activation of the event, the entry is discarded when its slot is reached. O(1)."""
+        event._wheel_entry = None
+
+    def advance(self, tick: int) -> None:
+        """Move the wheel forward to the given tick, the activations which became due are ready to be dispatched."""
+        while self._now < tick:
+            self._now += 1
+            # cascade the higher levels whose slot boundary is crossed, top level first
+            for level in range(len(self._levels) - 1, 0, -1):
+                if self._now & ((1 << (self._bits * level)) - 1) == 0:
+                    if level == len(self._levels) - 1:
+                        overflow, self._overflow = self._overflow, list()
+                        for entry in overflow:
+                            self._place(entry)
+                    slot = (self._now >> (self._bits * level)) & self._mask
+                    entries = self._levels[level][slot]
+                    self._levels[level][slot] = list()
+                    for entry in entries:
+                        self._place(entry)
+            slot = self._now & self._mask
+            entries = self._levels[0][slot]
+            self._levels[0][slot] = list()
+            for entry in entries:
+                self._ready_entry(entry)
+
+    def dispatch(self, priority: int) -> None:
+        """Activate the ready events of the given priority in the order they were created.
+
+        Events which became ready after their priority was dispatched, for example resumed by an event with a higher priority value, are moved to the next tick, like events driven by tasks.
+        """
+        while self._ready and self._ready[0][0] <= priority:
+            event_priority, _, _, entry = heapq.heappop(self._ready)
+            self._size -= 1
+            event = entry[1]
+            if event._wheel_entry is not entry:
+                continue
+            if event_priority < priority:
+                self.schedule(event, self._now + 1)
+                continue
+            event._wheel_entry = None
+            event._fire()
+
+    def _place(self, entry: list) -> None:
+        """Put the entry into the slot of the lowest level which covers its distance."""
+        delta = entry[0] - self._now
+        if delta <= 0:
+            self._ready_entry(entry)
+            return
+        for level in range(len(self._levels)):
+            if delta < 1 << (self._bits * (level + 1)):
+                slot = (entry[0] >> (self._bits * level)) & self._mask
+                self._levels[level][slot].append(entry)
+                return
+        self._overflow.append(entry)
+
+    def _ready_entry(self, entry: list) -> None:
+        """Queue the entry for dispatch in the current tick, ordered by priority and then by creation of the event."""
+        event = entry[1]
+        if event._wheel_entry is not entry:
+            self._size -= 1
+            return
+        heapq.heappush(
+            self._ready, (event.priority, event._order, next(self._sequence), entry)
+        )
+
+    @property
+    def now(self) -> int:
+        """The current tick of the wheel."""
+        return self._now
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import multiprocessing
+import sys
+import time
+from Akatosh import logger
+from Akatosh.event import Event
+from Akatosh.universe import Mundus
+
+EVENTS = 10000
+PERIODS = (0.001, 0.01, 0.1)
+TILL = 0.2
+
+
+def run(scheduler: str):
+    logger.setLevel(logging.ERROR)
+    Mundus.scheduler = scheduler
+    acts = [0]
+
+    def act():
+        acts[0] += 1
+
+    for i in range(EVENTS):
+        Event(0, TILL, act, step=PERIODS[i % len(PERIODS)], priority=i % 2)
+    start = time.perf_counter()
+    asyncio.run(Mundus.simulate(TILL))
+    print(f"{scheduler}:\t{EVENTS} periodic events, {acts[0]} acts in {time.perf_counter() - start:0.3f} seconds.")
+
+
+if __name__ == "__main__":
+    schedulers = sys.argv[1:] or ["task", "wheel"]
+    for scheduler in schedulers:
+        process = multiprocessing.get_context("fork").Process(target=run, args=(scheduler,))
+        process.start()
+        process.join()
@@ -0,0 +1,28 @@
+import asyncio
+import gc
+import logging
+from Akatosh import logger
+from Akatosh.entity import Entity
+from Akatosh.event import Event
+from Akatosh.universe import Mundus
+
+
+def spawn():
+    worker = Entity(Mundus.time, Mundus.time + 1, "Worker")
+
+    @worker.event(Mundus.time + 0.1, Mundus.time + 0.5)
+    def work():
+        pass
+
+
+def report():
+    gc.collect()
+    print(f"At {Mundus.time}: {Mundus.live_entities} live and {Mundus.retired_entities} retired entities, {Mundus.live_events} live and {Mundus.retired_events} retired events, {len(gc.get_objects())} objects.")
+
+
+Event(0, 20, spawn, step=0.1)
+Event(5, 20, report, step=5)
+
+logger.setLevel(logging.INFO)
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(20))
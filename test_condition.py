@@ -0,0 +1,23 @@
+import asyncio
+from Akatosh.condition import AllOf
+from Akatosh.entity import Entity
+from Akatosh.event import Event
+from Akatosh.resource import Resource
+from Akatosh.universe import Mundus
+
+tank = Resource(100.0)
+pump = Entity(0, 3, "Pump")
+
+
+@pump.event(0.5, 3, step=0.5)
+def drain():
+    pump.acquire(tank, 20)
+
+
+low = tank.when_below(30, lambda: print(f"Tank below 30 at {Mundus.time}"))
+AllOf(pump.when_terminated(), tank.when_above(50), action=lambda: print(f"Pump stopped and tank refilled at {Mundus.time}"))
+Event(low, 4, lambda: print(f"Refill waiting for low level at {Mundus.time}"), once=True)
+Event(3.5, 3.5, lambda: print(f"Tank level {tank.level} at {Mundus.time}"), once=True)
+
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(4))
@@ -0,0 +1,22 @@
+import asyncio
+from Akatosh.entity import Entity
+from Akatosh.resource import Resource
+from Akatosh.universe import Mundus
+
+res = Resource(100.0)
+users = [Entity(i * 0.5, i * 0.5 + 2, f"User {i}") for i in range(10)]
+
+for user in users:
+
+    @user.event(user.creation, user.termination)
+    def use(user=user):
+        user.acquire(res, 5)
+
+
+Mundus.monitor("usage", lambda: res.usage, period=1)
+Mundus.monitor("live entities", lambda: Mundus.live_entities, period=0.5)
+
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(8))
+for monitor in Mundus.monitors.values():
+    print(monitor.name, list(zip(monitor.times.tolist(), monitor.values.tolist())))
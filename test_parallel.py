@@ -0,0 +1,32 @@
+import logging
+from Akatosh import logger
+from Akatosh.event import Event
+from Akatosh.parallel import Partition, simulate
+from Akatosh.universe import Mundus
+
+
+def setup_zone(partition: Partition):
+    received = list()
+
+    @partition.receive
+    def on_pallet(pallet):
+        received.append((Mundus.time, pallet))
+
+    Event(
+        0.5,
+        4,
+        lambda: partition.send(partition.peers[0], f"pallet from {partition.name} at {Mundus.time}", 0.5),
+        step=1,
+    )
+
+    @partition.report
+    def report():
+        return received
+
+
+logger.setLevel(logging.INFO)
+Mundus.time_resolution = 1
+if __name__ == "__main__":
+    reports = simulate([Partition("Zone A", setup_zone), Partition("Zone B", setup_zone)], 5, 0.5)
+    for name, received in reports.items():
+        print(name, received)
@@ -0,0 +1,23 @@
+import asyncio
+from Akatosh.entity import Entity
+from Akatosh.event import Event
+from Akatosh.population import Population
+from Akatosh.universe import Mundus
+
+robots = Population({"position": 0.0, "battery": 100.0}, capacity=4, label="Robots")
+
+for i in range(10):
+    robots.join(Entity(i * 0.1, 1 + i * 0.1, f"Robot {i}"), position=float(i))
+
+
+@robots.event(0, 2, step=0.1)
+def move(population: Population):
+    active = population.active
+    population["position"][active] += 1.0
+    population["battery"][active] -= 0.5
+
+
+Event(2, 2, lambda: print(f"Positions {robots['position'][:10]}, active {robots.size}"), once=True)
+
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(2.1))
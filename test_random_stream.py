@@ -0,0 +1,16 @@
+import asyncio
+from Akatosh.event import Event
+from Akatosh.universe import Mundus
+
+Mundus.seed = 42
+arrivals = Mundus.stream("arrivals")
+
+customer = Event(
+    arrivals.exponential(1.0),
+    5,
+    lambda: print(f"Customer arrived at {Mundus.time}"),
+    step=lambda: arrivals.exponential(1.0),
+)
+
+Mundus.time_resolution = 2
+asyncio.run(Mundus.simulate(5))
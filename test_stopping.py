@@ -0,0 +1,24 @@
+import asyncio
+import logging
+from Akatosh import logger
+from Akatosh.entity import Entity
+from Akatosh.event import Event
+from Akatosh.stopping import Precision
+from Akatosh.universe import Mundus
+
+Mundus.seed = 7
+arrivals = Mundus.stream("arrivals")
+service = Mundus.stream("service")
+
+
+def arrive():
+    Entity(Mundus.time, Mundus.time + service.exponential(0.8), "Customer")
+
+
+Event(0, 100000, arrive, step=lambda: arrivals.exponential(1.0))
+Mundus.monitor("customers", lambda: Mundus.live_entities, period=1)
+
+logger.setLevel(logging.INFO)
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(100000, stop=Precision("customers", 0.05, relative=True, batch=50, period=50)))
+print(f"Stopped at {Mundus.time}: {Mundus.stop_reason}")
@@ -0,0 +1,40 @@
+import asyncio
+from Akatosh.entity import Entity
+from Akatosh.store import FilterStore, PriorityStore, Store
+from Akatosh.universe import Mundus
+
+buffer = Store(capacity=2, label="Buffer")
+urgent = PriorityStore(label="Urgent")
+pallets = FilterStore(label="Pallets")
+
+producer = Entity(0, 5, "Producer")
+consumer = Entity(0, 5, "Consumer")
+forklift = Entity(0, 2, "Forklift")
+
+
+@producer.event(0.5, 4, step=0.5)
+async def produce():
+    await buffer.put(producer, f"job at {Mundus.time}")
+    await urgent.put(producer, f"priority {int(Mundus.time * 2) % 3} job at {Mundus.time}", int(Mundus.time * 2) % 3)
+    await pallets.put(producer, {"color": "red" if Mundus.time < 1.5 else "blue"})
+
+
+@consumer.event(1, 5, step=1)
+async def consume():
+    print(f"Consumed {await buffer.get(consumer)} at {Mundus.time}")
+    print(f"Consumed {await urgent.get(consumer)} at {Mundus.time}")
+
+
+@forklift.event(0.1, 0.1, once=True)
+async def lift():
+    pallet = await pallets.get(forklift, lambda pallet: pallet["color"] == "green")
+    print(f"Never lifted {pallet}")
+
+
+@consumer.event(4.5, 4.5, once=True)
+def report():
+    print(f"Buffer mean level {buffer.mean_level:0.2f}, peak {buffer.peak_level}, forklift waiting on {forklift.stores}")
+
+
+Mundus.time_resolution = 1
+asyncio.run(Mundus.simulate(5))